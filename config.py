@@ -3,6 +3,10 @@ BASE_URL = "https://movie.douban.com"
 DELAY_RANGE = (1, 3)  # 随机延迟范围(秒)
 TIMEOUT = 10  # 请求超时时间(秒)
 MAX_RETRIES = 3  # 失败重试次数
+RETRY_BACKOFF = 0.5  # 重试指数退避基数(秒)
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)  # 需要重试的HTTP状态码
+CONCURRENCY = 4  # 最大并发请求数
+UA_POOL_SIZE = 16  # 随机User-Agent池大小
 
 # 请求头配置
 HEADERS = {
@@ -15,6 +19,8 @@ HEADERS = {
 # 文件配置
 OUTPUT_CSV = 'data/film_name.csv'  # 数据输出文件
 IMAGE_OUTPUT = 'data/director_top5.png'  # 可视化结果输出
+ROBOTS_CACHE = 'data/.robots_cache.json'  # robots.txt规则缓存文件
+ROBOTS_CACHE_TTL = 24 * 60 * 60  # robots.txt缓存有效期(秒)
 
 # 可视化配置
 PLOT_STYLE = 'ggplot'  # matplotlib样式
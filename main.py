@@ -6,22 +6,45 @@
 3. 进行基础数据分析与可视化（导演上榜数量TOP5统计）
 """
 
+import asyncio
+import json
 import logging
-import os
 import random
-import re
 import time
+import weakref
+from collections import Counter
 from datetime import datetime
+from pathlib import Path
 from urllib.robotparser import RobotFileParser
 
-import matplotlib.pyplot as plt
-import pandas as pd
-import requests
-from bs4 import BeautifulSoup
-from fake_useragent import UserAgent
+import aiohttp
+import lxml.html
+from lxml import etree
 
 from config import *
 
+logger = logging.getLogger(__name__)
+
+# 解析用XPath（模块级预编译，各页面和条目间复用；文本结果直接返回普通str）
+_ITEM_XPATH = etree.XPath("//ol[@class='grid_view']/li/div[@class='item']")
+_TITLE_XPATH = etree.XPath(".//span[@class='title'][1]/text()", smart_strings=False)
+_INFO_XPATH = etree.XPath(".//div[@class='bd']")
+_INFO_TEXT_XPATH = etree.XPath("(.//p)[1]//text()", smart_strings=False)
+_RATING_XPATH = etree.XPath(".//span[@class='rating_num']/text()", smart_strings=False)
+_NUM_XPATH = etree.XPath(".//div[@class='star']/span[last()]/text()", smart_strings=False)
+
+
+def _is_chinese_char(char):
+    """判断字符是否属于中文译名（CJK统一汉字或间隔号·）
+
+    Args:
+        char (str): 单个字符
+
+    Returns:
+        bool: 是否为中文译名字符
+    """
+    return '\u4e00' <= char <= '\u9fff' or char == '·'
+
 
 def ensure_dir_exists(path):
     """确保目录存在，如果不存在则创建
@@ -29,10 +52,13 @@ def ensure_dir_exists(path):
     Args:
         path (str): 文件或目录路径
     """
-    dir_path = os.path.dirname(path)
-    if dir_path and not os.path.exists(dir_path):
-        os.makedirs(dir_path, exist_ok=True)
-        logging.info(f"创建目录: {dir_path}")
+    # 直接尝试创建，已存在时由FileExistsError跳过，省去额外的exists检查
+    dir_path = Path(path).parent
+    try:
+        dir_path.mkdir(parents=True)
+        logger.info(f"创建目录: {dir_path}")
+    except FileExistsError:
+        pass
 
 
 def setup_logging():
@@ -65,136 +91,249 @@ def setup_logging():
 
 
 class DoubanScraper:
+    # 进程内共享的robots.txt规则缓存，多个实例无需重复获取（由异步锁保证只获取一次）
+    _robots_cache = None
+    _robots_locks = weakref.WeakKeyDictionary()  # 事件循环 -> asyncio.Lock
+
     def __init__(self):
-        """初始化爬虫实例，设置日志、检查robots.txt、创建输出目录"""
+        """初始化爬虫实例，设置日志、创建输出目录"""
         # 初始化日志系统
         self.log_file = setup_logging()
-        logging.info(f"豆瓣电影爬虫初始化完成，日志文件: {self.log_file}")
+        logger.info(f"豆瓣电影爬虫初始化完成，日志文件: {self.log_file}")
 
-        # 检查robots.txt是否允许爬取
-        if not self._check_robots_allowed():
-            logging.error("根据robots.txt规则，不允许爬取目标页面")
-            raise Exception("robots.txt禁止访问目标页面")
+        # User-Agent池在首次请求时才生成（见_random_user_agent）
+        self._ua_pool = None
 
         # 确保输出目录存在
         ensure_dir_exists(OUTPUT_CSV)
         ensure_dir_exists(IMAGE_OUTPUT)
+        ensure_dir_exists(ROBOTS_CACHE)
 
-        # 设置可视化样式
-        plt.style.use(PLOT_STYLE)
-        try:
-            # 设置中文字体和负号显示
-            plt.rcParams['font.sans-serif'] = ['SimSun']
-            plt.rcParams['axes.unicode_minus'] = False
-        except Exception as e:
-            logging.warning(f"中文字体加载失败，将使用默认字体: {str(e)}")
+    def _random_user_agent(self):
+        """从User-Agent池中随机选取一个
+
+        首次调用时才加载fake_useragent并预生成User-Agent池（实例化需加载数据库，只做一次）
+
+        Returns:
+            str: 随机User-Agent
+        """
+        if self._ua_pool is None:
+            from fake_useragent import UserAgent
+
+            ua = UserAgent()
+            self._ua_pool = [ua.random for _ in range(UA_POOL_SIZE)]
+        return random.choice(self._ua_pool)
 
-    def _check_robots_allowed(self):
+    async def _check_robots_allowed(self, session):
         """检查robots.txt是否允许爬取目标页面
 
+        Args:
+            session (aiohttp.ClientSession): 复用的HTTP会话
+
         Returns:
             bool: 是否允许爬取
         """
         try:
-            robots_url = BASE_URL + "/robots.txt"
-            logging.info(f"正在检查robots.txt: {robots_url}")
-
-            # 获取robots.txt内容
-            response = requests.get(
-                robots_url,
-                headers={'User-Agent': UserAgent().random},
-                timeout=TIMEOUT
-            )
-            response.raise_for_status()
-
-            # 解析robots.txt规则
-            rp = RobotFileParser()
-            rp.parse(response.text.splitlines())
+            rp = await self._load_robots_rules(session)
 
             # 检查是否允许爬取目标URL
             target_url = BASE_URL + "/top250"
             can_fetch = rp.can_fetch('*', target_url)
-            logging.info(f"robots.txt检查结果: {'允许' if can_fetch else '禁止'}爬取 {target_url}")
+            logger.info(f"robots.txt检查结果: {'允许' if can_fetch else '禁止'}爬取 {target_url}")
             return can_fetch
 
         except Exception as e:
-            logging.error(f"robots.txt检查失败: {str(e)}")
+            logger.error(f"robots.txt检查失败: {str(e)}")
             return False  # 默认禁止爬取，以防万一
 
-    def _get_page(self, url, params=None, retry=0):
-        """获取网页内容，带有重试机制和反爬策略
+    async def _load_robots_rules(self, session):
+        """获取robots.txt规则，优先使用进程内缓存和未过期的磁盘缓存
 
         Args:
-            url (str): 目标URL
-            params (dict, optional): 请求参数
-            retry (int, optional): 当前重试次数
+            session (aiohttp.ClientSession): 复用的HTTP会话
 
         Returns:
-            BeautifulSoup: 解析后的页面对象，失败返回None
+            RobotFileParser: 解析后的robots.txt规则
+        """
+        # 整个"查缓存 → 获取 → 写缓存"过程持有锁，并发调用者等待后直接复用结果
+        async with self._robots_lock():
+            if DoubanScraper._robots_cache is not None:
+                return DoubanScraper._robots_cache
+
+            lines = await asyncio.to_thread(self._read_robots_cache)
+            if lines is None:
+                robots_url = BASE_URL + "/robots.txt"
+                logger.info(f"正在检查robots.txt: {robots_url}")
+
+                # 获取robots.txt内容（与分页请求共用同一连接池）
+                async with session.get(
+                        robots_url,
+                        headers={'User-Agent': self._random_user_agent()}
+                ) as response:
+                    response.raise_for_status()
+                    robots_text = await response.text()
+                lines = robots_text.splitlines()
+                await asyncio.to_thread(self._write_robots_cache, lines)
+            else:
+                logger.info(f"使用robots.txt缓存: {ROBOTS_CACHE}")
+
+            # 解析robots.txt规则
+            rp = RobotFileParser()
+            rp.parse(lines)
+
+            DoubanScraper._robots_cache = rp
+            return rp
+
+    @classmethod
+    def _robots_lock(cls):
+        """获取当前事件循环对应的robots.txt类级锁
+
+        asyncio.Lock会绑定到首次使用它的事件循环，因此按循环分别创建，
+        多次asyncio.run之间互不影响
+
+        Returns:
+            asyncio.Lock: 当前事件循环的锁
+        """
+        loop = asyncio.get_running_loop()
+        lock = cls._robots_locks.get(loop)
+        if lock is None:
+            lock = cls._robots_locks[loop] = asyncio.Lock()
+        return lock
+
+    @staticmethod
+    def _write_robots_cache(lines):
+        """将robots.txt文本行连同获取时间写入磁盘缓存
+
+        Args:
+            lines (list): robots.txt文本行
+        """
+        try:
+            with open(ROBOTS_CACHE, 'w', encoding='utf-8') as f:
+                json.dump({'fetched_at': time.time(), 'lines': lines}, f, ensure_ascii=False)
+        except OSError as e:
+            logger.warning(f"robots.txt缓存写入失败: {e}")
+
+    @staticmethod
+    def _read_robots_cache():
+        """读取未过期的robots.txt磁盘缓存
+
+        Returns:
+            list: robots.txt文本行，缓存不存在、格式错误或已过期返回None
         """
         try:
-            # 随机延迟和动态User-Agent（反爬策略）
-            time.sleep(random.uniform(*DELAY_RANGE))
-            headers = HEADERS.copy()
-            headers['User-Agent'] = UserAgent().random
-
-            response = requests.get(
-                url,
-                headers=headers,
-                params=params,
-                timeout=TIMEOUT
-            )
-            response.raise_for_status()  # 自动处理4xx/5xx状态码
-
-            # 检查反爬机制（是否跳转到登录页）
-            if 'accounts.douban.com' in response.url:
-                raise requests.exceptions.RequestException("触发反爬机制")
-
-            return BeautifulSoup(response.text, 'html.parser')
-
-        except requests.exceptions.RequestException as e:
-            if retry < MAX_RETRIES:
-                logging.warning(f"请求失败，第{retry + 1}次重试: {e}")
-                return self._get_page(url, params, retry + 1)
-            logging.error(f"请求最终失败: {e}")
+            with open(ROBOTS_CACHE, encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        # 校验缓存结构，格式错误时视为无缓存，重新获取并覆盖
+        if not isinstance(cache, dict):
+            return None
+        fetched_at = cache.get('fetched_at')
+        lines = cache.get('lines')
+        if not isinstance(fetched_at, (int, float)) or not isinstance(lines, list):
+            return None
+        if not all(isinstance(line, str) for line in lines):
             return None
 
+        if time.time() - fetched_at < ROBOTS_CACHE_TTL:
+            return lines
+        return None
+
+    async def _get_page(self, session, semaphore, url, params=None):
+        """异步获取网页内容，带有指数退避重试和反爬策略
+
+        Args:
+            session (aiohttp.ClientSession): 复用的HTTP会话
+            semaphore (asyncio.Semaphore): 限制并发请求数的信号量
+            url (str): 目标URL
+            params (dict, optional): 请求参数
+
+        Returns:
+            lxml.html.HtmlElement: 解析后的页面文档树，失败返回None
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            delay = RETRY_BACKOFF * 2 ** attempt  # 指数退避间隔
+            try:
+                # 信号量限制并发数，首次请求前随机延迟和动态User-Agent（反爬策略）
+                async with semaphore:
+                    if attempt == 0:
+                        await asyncio.sleep(random.uniform(*DELAY_RANGE))
+                    headers = {'User-Agent': self._random_user_agent()}
+
+                    async with session.get(url, params=params, headers=headers) as response:
+                        # 服务端要求限流时优先遵循Retry-After
+                        retry_after = response.headers.get('Retry-After', '')
+                        if response.status in RETRY_STATUS_CODES and retry_after.isdigit():
+                            delay = int(retry_after)
+                        response.raise_for_status()  # 自动处理4xx/5xx状态码
+
+                        # 检查反爬机制（是否跳转到登录页）
+                        if 'accounts.douban.com' in str(response.url):
+                            raise aiohttp.ClientError("触发反爬机制")
+
+                        # 直接读取字节流交给lxml解码，避免先生成完整的str
+                        content = await response.read()
+                        parser = lxml.html.HTMLParser(encoding=response.charset or 'utf-8')
+
+                return lxml.html.fromstring(content, parser=parser)
+
+            except aiohttp.ClientResponseError as e:
+                if e.status not in RETRY_STATUS_CODES:
+                    logger.error(f"请求失败，状态码不可重试: {e}")
+                    return None
+                error = e
+            except (aiohttp.ClientError, asyncio.TimeoutError, etree.ParserError) as e:
+                # 包括空响应体导致的解析失败（lxml: Document is empty），与反爬跳转一样重试
+                error = e
+
+            # 重试等待在释放信号量之后进行，避免占用并发槽位
+            if attempt < MAX_RETRIES:
+                logger.warning(f"请求失败，{delay}秒后第{attempt + 1}次重试: {error}")
+                await asyncio.sleep(delay)
+
+        logger.error(f"请求最终失败: {error}")
+        return None
+
     def _parse_movie(self, item):
         """解析单个电影条目（核心解析逻辑）
 
         Args:
-            item (bs4.element.Tag): 包含电影信息的HTML标签
+            item (lxml.html.HtmlElement): 包含电影信息的HTML元素
 
         Returns:
             tuple: (电影数据字典, 是否被过滤)
         """
         try:
             # 电影标题（只取中文名）
-            title_tag = item.find('span', class_='title')
-            title = title_tag.text.strip() if title_tag else '无标题'
+            titles = _TITLE_XPATH(item)
+            title = titles[0].strip() if titles else '无标题'
             title = title.split('/')[0].strip()  # 处理外语片名
 
             # 导演和基本信息
-            info = item.find('div', class_='bd')
+            info = _INFO_XPATH(item)
             if not info:
                 return None, True  # 返回None和过滤标志
 
             # 提取导演信息（处理多种格式）
-            director_p = info.find('p')
-            if director_p:
-                director_text = director_p.get_text(strip=True)
-                # 提取导演部分，直到遇到" "或结尾
-                director_match = re.search(r'导演:(.*?)(?: |$)', director_text)
-                if director_match:
+            p_texts = _INFO_TEXT_XPATH(info[0])
+            if p_texts:
+                # 直接由文本节点得到各行：第一行为导演/主演，第二行为"年份 / 国家 / 类型"
+                lines = [s for s in map(str.strip, p_texts) if s] or ['']
+
+                # 按位置提取导演部分：第一行"导演:"之后，直到遇到"&nbsp;"或结尾
+                _, has_director, director_block = lines[0].partition('导演:')
+                if has_director:
                     directors = []
-                    for raw_name in director_match.group(1).split('/'):
+                    for raw_name in director_block.split('\xa0', 1)[0].split('/'):
                         name = raw_name.strip()
 
-                        # 优先提取中文部分（处理外国导演中文译名）
-                        chinese_part = re.sub(r'([\u4e00-\u9fff·]+).*', r'\1', name)
+                        # 优先提取开头的中文部分（处理外国导演中文译名），单次扫描即可
+                        end = 0
+                        while end < len(name) and _is_chinese_char(name[end]):
+                            end += 1
                         # 如果没有中文则保留整个名字
-                        final_name = chinese_part.strip() if re.search(r'[\u4e00-\u9fff]',
-                                                                       chinese_part) else name.strip()
+                        final_name = name[:end] if end else name
 
                         if final_name:
                             directors.append(final_name)
@@ -203,42 +342,41 @@ class DoubanScraper:
                 else:
                     director = '未知导演'
 
-                # 提取年份（匹配4位数字）
-                year_match = re.search(r'\d{4}', director_text)
-                year = year_match.group() if year_match else ''
-
-                # 国家/地区筛选（根据COUNTRY_FILTER配置）
-                p_text = director_p.get_text('\n', strip=True)
-                lines = p_text.split('\n')
+                year = None
                 if len(lines) > 1:
-                    country_line = lines[1]  # 例如："1994 / 美国 / 犯罪 剧情"
-                    # 找到所有以'/'分隔的元素
-                    country_matches = re.findall(r'/\s*([^/\n]+?)\s*/', country_line)
-                    if country_matches:
-                        country = country_matches[-1].strip()  # 取最后一个匹配项为国家/地区
+                    # 按位置拆分，例如："1994 / 美国 / 犯罪 剧情"
+                    parts = [part.strip() for part in lines[1].split('/')]
+
+                    # 提取年份（首项前4位为数字）
+                    if parts[0][:4].isdigit():
+                        year = int(parts[0][:4])
+
+                    # 国家/地区筛选（根据COUNTRY_FILTER配置）
+                    if len(parts) >= 3:
+                        country = parts[-2]  # 倒数第二项为国家/地区，最后一项为类型
                         # 如果配置了国家筛选且不匹配任何关键词，则过滤
                         if COUNTRY_FILTER and not any(
                                 keyword in country for keyword in COUNTRY_FILTER
                         ):
-                            logging.info(f"跳过国家/地区不匹配的电影: {title} ")
+                            logger.debug("跳过国家/地区不匹配的电影: %s", title)
                             return None, True
                     else:
                         # 如果没有匹配到国家信息，跳过该电影
-                        logging.info(f"无法提取国家/地区信息，跳过电影: {title}")
+                        logger.debug("无法提取国家/地区信息，跳过电影: %s", title)
                         return None, True
 
             else:
                 director = '未知导演'
-                year = ''
+                year = None
 
             # 评分（处理可能的缺失值）
-            rating_tag = item.find('span', class_='rating_num')
-            rating = float(rating_tag.text.strip()) if rating_tag else 0.0
+            ratings = _RATING_XPATH(item)
+            rating = float(ratings[0].strip()) if ratings else 0.0
 
-            # 评价人数（清洗特殊字符）
-            num_tag = item.find('span', string=re.compile(r'人评价'))
-            if num_tag:
-                num_str = re.sub(r'[人评价,]', '', num_tag.text.strip())
+            # 评价人数（div.star中最后一个span，清洗特殊字符）
+            num_texts = _NUM_XPATH(item)
+            if num_texts:
+                num_str = num_texts[0].strip().rstrip('人评价').replace(',', '')
                 num = int(num_str) if num_str.isdigit() else 0
             else:
                 num = 0
@@ -252,51 +390,74 @@ class DoubanScraper:
             }, False  # 返回电影数据和未过滤标志
 
         except Exception as e:
-            logging.error(f"解析电影失败: {e}\n原始HTML: {str(item)[:200]}...")
+            logger.error(f"解析电影失败: {e}\n原始HTML: {lxml.html.tostring(item, encoding='unicode')[:200]}...")
             return None, True  # 异常情况返回None和过滤标志
 
-    def scrape(self):
-        """执行爬取任务（分页处理TOP250）
+    async def scrape(self):
+        """执行爬取任务（并发获取TOP250各分页）
 
         Returns:
             list: 包含所有电影数据的字典列表
         """
-        movies = []
+        movies_by_title = {}  # 以电影名为键，同时完成去重并保持插入顺序
         filtered_count = 0
-        seen_titles = set()  # 用于去重的电影名集合
-        logging.info("开始爬取豆瓣Top250电影数据")
+        logger.info("开始爬取豆瓣Top250电影数据")
 
         # 构建完整的Top250页面URL
         top250_url = BASE_URL + "/top250"
 
-        # 分页处理（每页25条，共10页）
-        for start in range(0, MAX_ITEMS, ITEMS_PER_PAGE):
-            page_num = start // ITEMS_PER_PAGE + 1
-            logging.info(f"正在处理第 {page_num} 页数据...")
-
-            soup = self._get_page(top250_url, {'start': start})
-            if not soup:
+        # 复用单个会话：公共请求头、超时和keep-alive连接池在会话级别统一配置
+        semaphore = asyncio.Semaphore(CONCURRENCY)
+        async with aiohttp.ClientSession(
+                headers=HEADERS,
+                timeout=aiohttp.ClientTimeout(total=TIMEOUT),
+                connector=aiohttp.TCPConnector(limit_per_host=CONCURRENCY)
+        ) as session:
+            # 检查robots.txt是否允许爬取
+            if not await self._check_robots_allowed(session):
+                logger.error("根据robots.txt规则，不允许爬取目标页面")
+                raise Exception("robots.txt禁止访问目标页面")
+
+            # 并发获取所有分页（每页25条，共10页），由信号量控制并发数
+            # 单页的意外异常只影响该页，不丢弃其他页面的结果
+            trees = await asyncio.gather(*[
+                self._get_page(session, semaphore, top250_url, {'start': start})
+                for start in range(0, MAX_ITEMS, ITEMS_PER_PAGE)
+            ], return_exceptions=True)
+
+        # 按页序依次解析
+        for page_num, tree in enumerate(trees, 1):
+            if isinstance(tree, Exception):
+                logger.error(f"第 {page_num} 页获取失败，跳过该页: {tree}")
+                continue
+            if tree is None:
                 continue
 
-            items = soup.find_all('div', class_='item')
-            for item in items:
+            # 逐条日志降为DEBUG并延迟格式化，每页只输出一条汇总
+            parsed_count = skipped_count = 0
+            for item in _ITEM_XPATH(tree):
                 movie_data, is_filtered = self._parse_movie(item)
                 if movie_data:  # 确保有有效数据
                     # 去重检查：基于电影名
-                    if movie_data['中文电影名'] in seen_titles:
-                        logging.info(f"跳过重复电影: {movie_data['中文电影名']}")
-                        filtered_count += 1
+                    title = movie_data['中文电影名']
+                    if title in movies_by_title:
+                        logger.debug("跳过重复电影: %s", title)
+                        skipped_count += 1
                         continue
 
-                    seen_titles.add(movie_data['中文电影名'])
-                    movies.append(movie_data)
-                    logging.info(f"成功解析电影: {movie_data['中文电影名']}")
+                    movies_by_title[title] = movie_data
+                    parsed_count += 1
+                    logger.debug("成功解析电影: %s", title)
                 elif not is_filtered:  # 未被主动过滤的解析失败
-                    logging.warning(f"解析电影失败，跳过该条目")
+                    logger.warning("解析电影失败，跳过该条目")
                 else:
-                    filtered_count += 1
+                    skipped_count += 1
 
-        logging.info(f"共爬取到 {len(movies)} 部有效电影数据，过滤了 {filtered_count} 部不符合条件的电影")
+            filtered_count += skipped_count
+            logger.info(f"第 {page_num} 页: 解析 {parsed_count} 部，跳过 {skipped_count} 部")
+
+        movies = list(movies_by_title.values())
+        logger.info(f"共爬取到 {len(movies)} 部有效电影数据，过滤了 {filtered_count} 部不符合条件的电影")
         return movies
 
     def save_data(self, movies):
@@ -304,43 +465,67 @@ class DoubanScraper:
 
         Args:
             movies (list): 包含电影数据的字典列表
-        """
-        df = pd.DataFrame(movies)
-        df.index += 1  # 序号从1开始
 
-        # 数据清洗（处理异常值）
-        df['上映时间'] = pd.to_numeric(df['上映时间'], errors='coerce')
+        Returns:
+            list: 实际写入CSV的各电影导演（已按年份清洗）
+        """
+        import pandas as pd
+
+        # 按列构建并直接指定紧凑的可空类型，无需再逐列to_numeric转换
+        df = pd.DataFrame({
+            '中文电影名': [movie['中文电影名'] for movie in movies],
+            '导演': [movie['导演'] for movie in movies],
+            '上映时间': pd.array([movie['上映时间'] for movie in movies], dtype='Int16'),
+            '豆瓣评分': pd.array([movie['豆瓣评分'] for movie in movies], dtype='float32'),
+            '参评人数': pd.array([movie['参评人数'] for movie in movies], dtype='Int32'),
+        }, index=pd.RangeIndex(1, len(movies) + 1))  # 序号从1开始
+
+        # 数据清洗（过滤缺失或异常的年份）
         df = df[df['上映时间'].between(MIN_YEAR, pd.Timestamp.now().year)]
-        df['参评人数'] = pd.to_numeric(df['参评人数'], errors='coerce')
 
-        # 确保输出目录存在
-        ensure_dir_exists(OUTPUT_CSV)
-
-        # 保存前再次去重（二次校验）
-        df.drop_duplicates(subset=['中文电影名'], keep='first', inplace=True)
         df.to_csv(OUTPUT_CSV, encoding='utf-8-sig', index_label='序号')
-        logging.info(f"数据已保存到 {OUTPUT_CSV}")
+        logger.info(f"数据已保存到 {OUTPUT_CSV}")
+        return df['导演'].tolist()
+
+    def analyze(self, directors=None):
+        """执行数据分析与可视化（导演上榜数量TOP5统计）
+
+        Args:
+            directors (list, optional): 已保存电影的导演列表（save_data的返回值），未提供时从CSV文件读取
+        """
+        import matplotlib.pyplot as plt
 
-    def analyze(self):
-        """执行数据分析与可视化（导演上榜数量TOP5统计）"""
         try:
-            df = pd.read_csv(OUTPUT_CSV, encoding='utf-8-sig')
+            # 获取导演统计（优先使用内存中的数据，避免回读CSV）
+            if directors is not None:
+                director_counts = Counter(directors)
+            else:
+                import pandas as pd
 
-            # 获取导演统计（包含处理并列情况）
-            director_counts = df['导演'].value_counts()
+                df = pd.read_csv(OUTPUT_CSV, encoding='utf-8-sig')
+                director_counts = Counter(df['导演'])
 
-            # 获取第5名的值（处理并列排名）
-            top5_value = director_counts.iloc[4] if len(director_counts) >= 5 else director_counts.min()
+            # 按数量降序排列，并获取第5名的值（处理并列排名）
+            ranked = director_counts.most_common()
+            top5_value = ranked[min(4, len(ranked) - 1)][1]
 
             # 获取所有达到或超过第5名值的导演
-            top_directors = director_counts[director_counts >= top5_value]
-
-            # 按值降序排序
-            top_directors = top_directors.sort_values(ascending=False)
+            top_directors = [(name, count) for name, count in ranked if count >= top5_value]
+            labels = [name for name, _ in top_directors]
+            values = [count for _, count in top_directors]
+
+            # 设置可视化样式
+            plt.style.use(PLOT_STYLE)
+            try:
+                # 设置中文字体和负号显示
+                plt.rcParams['font.sans-serif'] = ['SimSun']
+                plt.rcParams['axes.unicode_minus'] = False
+            except Exception as e:
+                logger.warning(f"中文字体加载失败，将使用默认字体: {str(e)}")
 
             # 可视化设置
-            plt.figure(figsize=PLOT_SIZE)
-            top_directors.plot(kind='bar', color=BAR_COLOR)
+            _, ax = plt.subplots(figsize=PLOT_SIZE)
+            ax.bar(labels, values, color=BAR_COLOR)
 
             # 构建标题（包含国家筛选信息）
             title = '豆瓣Top250电影导演上榜数量TOP5+'
@@ -353,29 +538,26 @@ class DoubanScraper:
             plt.xticks(rotation=45 if len(top_directors) > 5 else 0)  # 动态调整标签旋转
 
             # 添加数据标签（增强可读性）
-            for i, v in enumerate(top_directors):
+            for i, v in enumerate(values):
                 plt.text(i, v + 0.2, str(v), ha='center')
 
-            # 确保输出目录存在
-            ensure_dir_exists(IMAGE_OUTPUT)
-
             plt.tight_layout()
             plt.savefig(IMAGE_OUTPUT)
-            logging.info(f"可视化结果已保存到 {IMAGE_OUTPUT}")
+            logger.info(f"可视化结果已保存到 {IMAGE_OUTPUT}")
 
         except Exception as e:
-            logging.error(f"数据分析失败: {e}")
+            logger.error(f"数据分析失败: {e}")
 
 
 if __name__ == '__main__':
     try:
         scraper = DoubanScraper()
-        movies = scraper.scrape()
+        movies = asyncio.run(scraper.scrape())
 
         if movies:
-            scraper.save_data(movies)
-            scraper.analyze()
+            directors = scraper.save_data(movies)
+            scraper.analyze(directors)
         else:
-            logging.error("未获取到有效数据，程序终止")
+            logger.error("未获取到有效数据，程序终止")
     except Exception as e:
-        logging.error(f"程序运行异常: {e}")
\ No newline at end of file
+        logger.error(f"程序运行异常: {e}")
\ No newline at end of file